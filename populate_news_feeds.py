@@ -10,22 +10,18 @@ def generate_feed_data(keywords, suffix="", m=4):
     :return: list of feeds
     """
 
-    feeds = []
-    for k in keywords:
-        k = k.replace(" ", "+")
-        for i in range(1, m):
-            rss_url = f"https://www.bing.com/news/search?format=RSS&q={k}+{suffix}&&first={i*11}"
-
-            feed = {
-                "url_site": "",
-                "category": "",
-                "leaning": "",
-                "name": f"Bing - {k}",
-                "feed_url": rss_url,
-            }
-
-            feeds.append(feed)
-    return feeds
+    terms = [k.replace(" ", "+") for k in keywords]
+    return [
+        {
+            "url_site": "",
+            "category": "",
+            "leaning": "",
+            "name": f"Bing - {k}",
+            "feed_url": f"https://www.bing.com/news/search?format=RSS&q={k}+{suffix}&&first={i*11}",
+        }
+        for k in terms
+        for i in range(1, m)
+    ]
 
 
 def generate_feed(filename, topics, suffix=""):
@@ -37,7 +33,8 @@ def generate_feed(filename, topics, suffix=""):
     :param suffix: suffix to add to the research terms to specify a general context (e.g., 'Olympics')
     """
     feeds = generate_feed_data(topics, suffix=suffix)
-    json.dump(feeds, open(filename, "w"), indent=4)
+    with open(filename, "w") as f:
+        json.dump(feeds, f, indent=4)
 
 
 if __name__ == "__main__":
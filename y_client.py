@@ -1,4 +1,66 @@
 import os, sys, json, shutil
+from importlib import import_module
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# module defining each selectable recommender system and simulation client
+CONTENT_RECSYS = {
+    name: "y_client.recsys.ContentRecSys"
+    for name in [
+        "ContentRecSys",
+        "ReverseChrono",
+        "ReverseChronoPopularity",
+        "ReverseChronoFollowers",
+        "ReverseChronoFollowersPopularity",
+    ]
+}
+FOLLOW_RECSYS = {
+    name: "y_client.recsys.FollowRecSys"
+    for name in [
+        "FollowRecSys",
+        "CommonNeighbors",
+        "Jaccard",
+        "AdamicAdar",
+        "PreferentialAttachment",
+    ]
+}
+CLIENTS = {
+    "YClientBase": "y_client.clients.client_base",
+    "YClientWithPages": "y_client.clients.client_with_pages",
+}
+
+
+def load_class(registry, name):
+    """
+    Import the module of a registered class and return the class
+
+    :param registry: the registry mapping class names to their modules
+    :param name: the class name
+    :return: the class
+    """
+    return getattr(import_module(registry[name]), name)
+
+
+def stage_config(config_file, current="experiments/current_config.json"):
+    """
+    Set the current experiment config file, hard-linking it when possible
+
+    :param config_file: the simulation configuration file
+    :param current: the current experiment config file
+    """
+    os.makedirs(os.path.dirname(current), exist_ok=True)
+    if os.path.exists(current):
+        if os.path.samefile(config_file, current):
+            return
+        os.remove(current)
+    try:
+        os.link(config_file, current)
+    except OSError:
+        shutil.copyfile(config_file, current)
+
 
 if __name__ == "__main__":
     SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -48,13 +110,15 @@ if __name__ == "__main__":
         "-x",
         "--crecsys",
         default="ReverseChronoFollowersPopularity",
-        help="Name of the content recsys to be used. Options: ...",
+        choices=list(CONTENT_RECSYS),
+        help="Name of the content recsys to be used",
     )
     parser.add_argument(
         "-y",
         "--frecsys",
         default="PreferentialAttachment",
-        help="Name of the follower recsys to be used. Options: ...",
+        choices=list(FOLLOW_RECSYS),
+        help="Name of the follower recsys to be used",
     )
 
     parser.add_argument(
@@ -64,6 +128,13 @@ if __name__ == "__main__":
         help="Name of the graph file (CSV format, number of nodes equal to the starting agents) "
         "to be used for the simulation",
     )
+    parser.add_argument(
+        "-s",
+        "--seed",
+        default=None,
+        type=int,
+        help="Random seed of the simulation (overrides the configuration one)",
+    )
 
     args = parser.parse_args()
 
@@ -75,29 +146,26 @@ if __name__ == "__main__":
     graph_file = args.graph
 
     # get simulation client and name
-    config = json.load(open(config_file, "r"))
+    with open(config_file, "rb") as f:
+        config = orjson.loads(f.read()) if orjson is not None else json.load(f)
     client_name = config["simulation"]["client"]
     simulation_name = config["simulation"]["name"]
+    if args.seed is not None:
+        config["simulation"]["seed"] = args.seed
 
     # agent file output
     output = f"experiments/{simulation_name}_agents.json"
 
     # set the current config file (needed to generate the database)
-    shutil.copyfile(config_file, f"experiments/current_config.json")
-
-    import y_client.recsys
-    import y_client.clients
-
-    if not os.path.exists("./experiments"):
-        os.mkdir("./experiments")
+    stage_config(config_file)
 
     # get recommender systems
-    content_recsys = getattr(y_client.recsys, args.crecsys)()
-    follow_recsys = getattr(y_client.recsys, args.frecsys)(leaning_bias=1.5)
+    content_recsys = load_class(CONTENT_RECSYS, args.crecsys)()
+    follow_recsys = load_class(FOLLOW_RECSYS, args.frecsys)(leaning_bias=1.5)
 
     # get and instantiate the client
-    experiment = getattr(y_client.clients, client_name)(
-        config_file,
+    experiment = load_class(CLIENTS, client_name)(
+        config,
         prompts_file,
         agents_filename=agents_file,
         owner=agents_owner,
@@ -120,3 +188,4 @@ if __name__ == "__main__":
 
     experiment.save_agents()
     experiment.run_simulation()
+    experiment.close()
@@ -1,7 +1,37 @@
-try:
-    from y_client.classes.base_agent import *
-    from y_client.classes.page_agent import *
-    from y_client.classes.time import *
-    from y_client.recsys import *
-except:
-    from y_client.clients import YClientWeb
\ No newline at end of file
+from importlib import import_module
+
+# module exporting each public name, imported on first access (PEP 562) so that
+# importing the package does not load the agents' LLM and database stack
+_EXPORTS = {
+    "Agent": "y_client.classes.base_agent",
+    "Agents": "y_client.classes.base_agent",
+    "PageAgent": "y_client.classes.page_agent",
+    "SimulationSlot": "y_client.classes.time",
+    "ContentRecSys": "y_client.recsys.ContentRecSys",
+    "ReverseChrono": "y_client.recsys.ContentRecSys",
+    "ReverseChronoPopularity": "y_client.recsys.ContentRecSys",
+    "ReverseChronoFollowers": "y_client.recsys.ContentRecSys",
+    "ReverseChronoFollowersPopularity": "y_client.recsys.ContentRecSys",
+    "FollowRecSys": "y_client.recsys.FollowRecSys",
+    "CommonNeighbors": "y_client.recsys.FollowRecSys",
+    "Jaccard": "y_client.recsys.FollowRecSys",
+    "AdamicAdar": "y_client.recsys.FollowRecSys",
+    "PreferentialAttachment": "y_client.recsys.FollowRecSys",
+    "YClientWeb": "y_client.clients.client_web",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
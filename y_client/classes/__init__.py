@@ -1,3 +1,25 @@
-from .base_agent import *
-from .page_agent import *
-from .time import *
+from importlib import import_module
+
+# module exporting each public name, imported on first access (PEP 562)
+_EXPORTS = {
+    "Agent": ".base_agent",
+    "Agents": ".base_agent",
+    "PageAgent": ".page_agent",
+    "SimulationSlot": ".time",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
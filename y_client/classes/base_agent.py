@@ -6,7 +6,7 @@ from sqlalchemy.sql.expression import func
 from y_client.news_feeds.feed_reader import NewsFeed
 from y_client.classes.time import SimulationSlot
 import random
-from requests import get, post
+from y_client.connection import get, post
 import json
 from autogen import AssistantAgent
 import numpy as np
@@ -14,6 +14,12 @@ import re
 
 __all__ = ["Agent", "Agents"]
 
+# regex patterns of the components extracted from the generated texts
+_COMPONENT_PATTERNS = {
+    "hashtags": re.compile(r"#\w+"),
+    "mentions": re.compile(r"@\w+"),
+}
+
 
 class Agent(object):
     def __init__(
@@ -111,7 +117,6 @@ class Agent(object):
                 self.education_level = education_level
                 self.joined_on = joined_on
                 sc = SimulationSlot(config)
-                sc.get_current_slot()
                 self.joined_on = sc.id
                 self.round_actions = round_actions
                 self.gender = gender
@@ -270,7 +275,6 @@ class Agent(object):
             self.education_level = education_level
             self.joined_on = joined_on
             sc = SimulationSlot(config)
-            sc.get_current_slot()
             self.joined_on = sc.id
             self.round_actions = round_actions
             self.gender = gender
@@ -362,13 +366,15 @@ class Agent(object):
         """
         Set the LLM prompts.
 
-        :param prompts: the prompts
+        :param prompts: the prompts (a read-only mapping shared among the agents)
         """
         self.prompts = prompts
 
         # if the agent has custom prompts substitute the default ones
         aprompt = session.query(Agent_Custom_Prompt).filter_by(agent_name=self.name).first()
         if aprompt:
+            # customize a private copy, leaving the shared prompts untouched
+            self.prompts = dict(prompts)
             self.prompts["agent_roleplay"] = f"{aprompt.prompt} - Act as requested by the Handler."
             self.prompts["agent_roleplay_simple"] = f"{aprompt.prompt} - Act as requested by the Handler."
             self.prompts["agent_roleplay_base"] = f"{aprompt.prompt} - Act as requested by the Handler."
@@ -423,12 +429,8 @@ class Agent(object):
         :param c_type: the component type
         :return: the extracted components
         """
-        # Define the regex pattern
-        if c_type == "hashtags":
-            pattern = re.compile(r"#\w+")
-        elif c_type == "mentions":
-            pattern = re.compile(r"@\w+")
-        else:
+        pattern = _COMPONENT_PATTERNS.get(c_type)
+        if pattern is None:
             return []
         # Find all matches in the input text
         hashtags = pattern.findall(text)
@@ -1261,86 +1263,140 @@ class Agent(object):
         u1.reset()
         u2.reset()
 
-        if "COMMENT" in text.split():
-            candidates = json.loads(self.read())
-            if len(candidates) > 0:
-                selected_post = random.sample(candidates, 1)
-                self.comment(
-                    int(selected_post[0]),
-                    max_length_threads=max_length_thread_reading,
-                    tid=tid,
-                )
-                self.reaction(int(selected_post[0]), check_follow=False, tid=tid)
+        # the first known action (in priority order) found in the answer is performed
+        tokens = set(text.split())
+        for action, handler in self._action_handlers:
+            if action in tokens:
+                getattr(self, handler)(tid, max_length_thread_reading)
+                break
 
-        elif "POST" in text.split():
-            self.post(tid=tid)
+        return
 
-        elif "READ" in text.split():
-            candidates = json.loads(self.read())
-            try:
-                selected_post = random.sample(candidates, 1)
-                self.reaction(int(selected_post[0]), tid=tid)
-            except:
-                pass
+    def _comment_action(self, tid, max_length_thread_reading):
+        """
+        Comment (and react to) a recommended post.
 
-        # elif "REPLY" in text.split():
-        #    selected_post = json.loads(self.read_mentions())
-        #    if "status" not in selected_post:
-        #        self.comment(
-        #            int(selected_post[0]),
-        #            max_length_threads=max_length_thread_reading,
-        #            tid=tid,
-        #        )
-
-        elif "SEARCH" in text.split():
-            candidates = json.loads(self.search())
-            if "status" not in candidates and len(candidates) > 0:
-                selected_post = random.sample(candidates, 1)
-                self.comment(
-                    int(selected_post[0]),
-                    max_length_threads=max_length_thread_reading,
-                    tid=tid,
-                )
-                self.reaction(int(selected_post[0]), check_follow=False, tid=tid)
-
-        elif "FOLLOW" in text.split():
-            candidates = self.search_follow()
-            if len(candidates) > 0:
-                tot = sum([float(v) for v in candidates.values()])
-                probs = [v / tot for v in candidates.values()]
-                selected = np.random.choice(
-                    [int(c) for c in candidates],
-                    p=probs,
-                    size=1,
-                )[0]
-                self.follow(tid=tid, target=selected, action="follow")
-
-        # demanded to page agents
-        # elif "NEWS" in text.split():
-        #    news, website = self.select_news()
-        #    if not isinstance(news, str):
-        #        self.news(tid=tid, article=news, website=website)
-
-        elif "SHARE" in text.split():
-            candidates = json.loads(self.read(article=True))
-            if len(candidates) > 0:
-                selected_post = random.sample(candidates, 1)
-                self.share(int(selected_post[0]), tid=tid)
-
-        elif "CAST" in text.split():
-            candidates = json.loads(self.read())
-            try:
-                selected_post = random.sample(candidates, 1)
-                self.cast(int(selected_post[0]), tid=tid)
-            except:
-                pass
+        :param tid: the round id
+        :param max_length_thread_reading: the maximum length of the thread to read
+        """
+        candidates = json.loads(self.read())
+        if len(candidates) > 0:
+            selected_post = random.choice(candidates)
+            self.comment(
+                int(selected_post),
+                max_length_threads=max_length_thread_reading,
+                tid=tid,
+            )
+            self.reaction(int(selected_post), check_follow=False, tid=tid)
 
-        elif "IMAGE" in text.split():
-            image, article_id = self.select_image(tid=tid)
-            if image is not None:
-                self.comment_image(image, tid=tid, article_id=article_id)
+    def _post_action(self, tid, max_length_thread_reading):
+        """
+        Write a new post.
 
-        return
+        :param tid: the round id
+        :param max_length_thread_reading: unused
+        """
+        self.post(tid=tid)
+
+    def _read_action(self, tid, max_length_thread_reading):
+        """
+        React to a recommended post.
+
+        :param tid: the round id
+        :param max_length_thread_reading: unused
+        """
+        candidates = json.loads(self.read())
+        try:
+            selected_post = random.choice(candidates)
+            self.reaction(int(selected_post), tid=tid)
+        except:
+            pass
+
+    def _search_action(self, tid, max_length_thread_reading):
+        """
+        Comment (and react to) a post retrieved by a search.
+
+        :param tid: the round id
+        :param max_length_thread_reading: the maximum length of the thread to read
+        """
+        candidates = json.loads(self.search())
+        if "status" not in candidates and len(candidates) > 0:
+            selected_post = random.choice(candidates)
+            self.comment(
+                int(selected_post),
+                max_length_threads=max_length_thread_reading,
+                tid=tid,
+            )
+            self.reaction(int(selected_post), check_follow=False, tid=tid)
+
+    def _follow_action(self, tid, max_length_thread_reading):
+        """
+        Follow one of the suggested users.
+
+        :param tid: the round id
+        :param max_length_thread_reading: unused
+        """
+        candidates = self.search_follow()
+        if len(candidates) > 0:
+            tot = sum([float(v) for v in candidates.values()])
+            probs = [v / tot for v in candidates.values()]
+            selected = np.random.choice(
+                [int(c) for c in candidates],
+                p=probs,
+                size=1,
+            )[0]
+            self.follow(tid=tid, target=selected, action="follow")
+
+    def _share_action(self, tid, max_length_thread_reading):
+        """
+        Share a recommended post containing a news article.
+
+        :param tid: the round id
+        :param max_length_thread_reading: unused
+        """
+        candidates = json.loads(self.read(article=True))
+        if len(candidates) > 0:
+            selected_post = random.choice(candidates)
+            self.share(int(selected_post), tid=tid)
+
+    def _cast_action(self, tid, max_length_thread_reading):
+        """
+        Cast a voting intention on a recommended post.
+
+        :param tid: the round id
+        :param max_length_thread_reading: unused
+        """
+        candidates = json.loads(self.read())
+        try:
+            selected_post = random.choice(candidates)
+            self.cast(int(selected_post), tid=tid)
+        except:
+            pass
+
+    def _image_action(self, tid, max_length_thread_reading):
+        """
+        Comment an image.
+
+        :param tid: the round id
+        :param max_length_thread_reading: unused
+        """
+        image, article_id = self.select_image(tid=tid)
+        if image is not None:
+            self.comment_image(image, tid=tid, article_id=article_id)
+
+    # action handlers, in priority order
+    # (REPLY is performed by reply(), NEWS is demanded to page agents)
+    # (looked up by name, so that subclasses can override them)
+    _action_handlers = (
+        ("COMMENT", "_comment_action"),
+        ("POST", "_post_action"),
+        ("READ", "_read_action"),
+        ("SEARCH", "_search_action"),
+        ("FOLLOW", "_follow_action"),
+        ("SHARE", "_share_action"),
+        ("CAST", "_cast_action"),
+        ("IMAGE", "_image_action"),
+    )
 
     def reply(self, tid: int, max_length_thread_reading: int = 5):
         """
@@ -1374,7 +1430,7 @@ class Agent(object):
 
         :return: the response from the service
         """
-        return self.content_rec_sys.read_mentions(self.base_url)
+        return self.content_rec_sys.read_mentions(self.base_url, self.user_id)
 
     def search(self):
         """
@@ -1382,7 +1438,7 @@ class Agent(object):
 
         :return: the response from the service
         """
-        return self.content_rec_sys.search(self.base_url)
+        return self.content_rec_sys.search(self.base_url, self.user_id)
 
     def search_follow(self):
         """
@@ -1390,7 +1446,7 @@ class Agent(object):
 
         :return: the response from the service
         """
-        return self.follow_rec_sys.follow_suggestions(self.base_url)
+        return self.follow_rec_sys.follow_suggestions(self.base_url, self.user_id)
 
     def select_news(self):
         """
@@ -1444,7 +1500,6 @@ class Agent(object):
                 else:
                     # annotate the image with a description
                     an = Annotator(config=self.llm_v_config)
-                    print("IMAGE", self.llm_v_config)
                     description = an.annotate(image.url)
                     image.description = description
                     session.commit()
@@ -1725,13 +1780,14 @@ class Agents(object):
 
     def remove_agent_by_ids(self, agent_ids: list):
         """
-        Remove a profile from the Agents object.
+        Remove the profiles with the given ids from the Agents object.
 
-        :param agent: The Profile object to remove.
+        :param agent_ids: The ids of the profiles to remove.
         """
-        for agent in self.agents:
-            if agent.user_id in agent_ids:
-                self.agents.remove(agent)
+        agent_ids = set(agent_ids)
+        self.agents[:] = [
+            agent for agent in self.agents if agent.user_id not in agent_ids
+        ]
 
     def get_agents(self):
         return self.agents
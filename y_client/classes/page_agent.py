@@ -1,11 +1,13 @@
-from y_client.classes.base_agent import Agent
+from y_client.classes.base_agent import Agent, _COMPONENT_PATTERNS
 from y_client.news_feeds.client_modals import Websites, session
 from y_client.news_feeds.feed_reader import NewsFeed
-from requests import post
+from y_client.connection import post
 from autogen import AssistantAgent
 import json
 import re
 
+_TOPIC_PATTERN = re.compile(r"[#T]: \w+ \w+")
+
 
 class PageAgent(Agent):
     def __init__(self, *args, **kwargs):
@@ -82,7 +84,7 @@ class PageAgent(Agent):
 
         topic_eval = u2.chat_messages[u1][-1]["content"]
 
-        topics = re.findall(r"[#T]: \w+ \w+", topic_eval)
+        topics = _TOPIC_PATTERN.findall(topic_eval)
         topics = [x.split(": ")[1] for x in topics if "Topic" not in x]
 
         post_text = u2.chat_messages[u1][-2]["content"]
@@ -141,12 +143,8 @@ class PageAgent(Agent):
         :param c_type: the component type
         :return: the extracted components
         """
-        # Define the regex pattern
-        if c_type == "hashtags":
-            pattern = re.compile(r"#\w+")
-        elif c_type == "mentions":
-            pattern = re.compile(r"@\w+")
-        else:
+        pattern = _COMPONENT_PATTERNS.get(c_type)
+        if pattern is None:
             return []
         # Find all matches in the input text
         hashtags = pattern.findall(text)
@@ -1,9 +1,37 @@
 import json
-from requests import get, post
+from y_client.connection import get, post
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 __all__ = ["SimulationSlot"]
 
 
+def _loads(response):
+    """
+    Parse the JSON body of a server response (with orjson, when available)
+
+    :param response: the server response
+    :return: the parsed body
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+def _slot_key(day, slot):
+    """
+    Pack a (day, slot) pair into an integer ordered as the simulation time
+
+    :param day: the day
+    :param slot: the slot of the day
+    :return: the packed key
+    """
+    return (day << 16) | slot
+
+
 class SimulationSlot(object):
     def __init__(self, config):
         """
@@ -18,12 +46,15 @@ class SimulationSlot(object):
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
         response = get(f"{api_url}", headers=headers)
-        data = json.loads(response.__dict__["_content"].decode("utf-8"))
+        data = _loads(response)
 
         self.day = data["day"]
         self.slot = data["round"]
         self.id = data["id"]
 
+        # last position posted by this clock: updates never go back in time
+        self._last_key = -1
+
     def get_current_slot(self):
         """
         Get the current slot.
@@ -36,7 +67,7 @@ class SimulationSlot(object):
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
         response = get(f"{api_url}", headers=headers)
-        data = json.loads(response.__dict__["_content"].decode("utf-8"))
+        data = _loads(response)
 
         self.day = data["day"]
         self.slot = data["round"]
@@ -61,12 +92,16 @@ class SimulationSlot(object):
 
         _, day_c, slot_c = self.get_current_slot()
 
-        if day >= day_c or slot > slot_c:
+        # only move the server clock forward: past its current position (another
+        # client may have advanced it) and past the last update posted from here
+        key = _slot_key(day, slot)
+        if key > max(_slot_key(day_c, slot_c), self._last_key):
             params = {"day": day, "round": slot}
             st = json.dumps(params)
             response = post(f"{api_url}", headers=headers, data=st)
-            data = json.loads(response.__dict__["_content"].decode("utf-8"))
+            data = _loads(response)
 
             self.day = int(data["day"])
             self.slot = int(data["round"])
             self.id = int(data["id"])
+            self._last_key = key
@@ -1,15 +1,21 @@
+import json
 import random
 import tqdm
 import sys
 import os
 import networkx as nx
+import numpy as np
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from itertools import compress
+from faker import Faker
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.dirname(SCRIPT_DIR))
 
 from y_client import Agent, Agents, SimulationSlot
-from y_client.recsys import *
-from y_client.utils import generate_user
+from y_client.utils import generate_user, load_json, dump_json
+from y_client.connection import http_session, post, configure
 from y_client.news_feeds import Feeds, session, Websites, Articles, Images
 
 
@@ -26,7 +32,7 @@ class YClientBase(object):
         """
         Initialize the YClient object
 
-        :param config_filename: the configuration file for the simulation in JSON format
+        :param config_filename: the configuration file for the simulation in JSON format (or the parsed configuration)
         :param prompts_filename: the LLM prompts file for the simulation in JSON format
         :param agents_filename: the file containing the agents in JSON format
         :param graph_file: the file containing the graph of the agents in CSV format, where the number of nodes is equal to the number of agents
@@ -36,8 +42,13 @@ class YClientBase(object):
         if prompts_filename is None:
             raise Exception("Prompts file not found")
 
-        self.prompts = json.load(open(prompts_filename, "r"))
-        self.config = json.load(open(config_filename, "r"))
+        # a single read-only copy of the prompts is shared by all the agents
+        self.prompts = MappingProxyType(load_json(prompts_filename))
+        # the configuration can also be passed already parsed
+        if isinstance(config_filename, dict):
+            self.config = config_filename
+        else:
+            self.config = load_json(config_filename)
         self.agents_owner = owner
         self.agents_filename = agents_filename
         self.agents_output = agents_output
@@ -49,6 +60,10 @@ class YClientBase(object):
             "percentage_new_agents_iteration"
         ]
         self.hourly_activity = self.config["simulation"]["hourly_activity"]
+        # activity rates indexed by hour (avoids int->str lookups in the slot loop)
+        self._hourly_activity = np.array(
+            [float(self.hourly_activity[str(h)]) for h in range(24)]
+        )
         self.percentage_removed_agents_iteration = float(
             self.config["simulation"]["percentage_removed_agents_iteration"]
         )
@@ -60,6 +75,9 @@ class YClientBase(object):
         self.actions_likelihood = {
             k: v / tot for k, v in self.actions_likelihood.items()
         }
+        # available actions and their sampling probabilities
+        self._acts = [a for a, v in self.actions_likelihood.items() if v > 0]
+        self._acts_p = [self.actions_likelihood[a] for a in self._acts]
 
         # users' parameters
         self.fratio = self.config["agents"]["reading_from_follower_ratio"]
@@ -70,6 +88,29 @@ class YClientBase(object):
         # posts' parameters
         self.visibility_rd = self.config["posts"]["visibility_rounds"]
 
+        # number of workers used to dispatch the agents' actions (1: sequential)
+        try:
+            self.n_workers = int(self.config["simulation"]["n_workers"])
+        except KeyError:
+            self.n_workers = 1
+
+        # one keep-alive connection per worker
+        configure(self.n_workers)
+
+        if self.n_workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.n_workers)
+        else:
+            self._executor = None
+
+        # random generator driving the simulation (optionally seeded)
+        seed = self.config["simulation"].get("seed")
+        self._rng = np.random.default_rng(seed)
+        if seed is not None:
+            # agents draw from the global generators, and their profiles from Faker
+            random.seed(seed)
+            np.random.seed(seed)
+            Faker.seed(seed)
+
         # initialize simulation clock
         self.sim_clock = SimulationSlot(self.config)
 
@@ -87,14 +128,47 @@ class YClientBase(object):
 
         self.pages = []
 
+    def _map(self, func, items):
+        """
+        Apply a function to each item, concurrently if a worker pool is available
+
+        :param func: the function to apply
+        :param items: the items to process
+        :return: an iterator over the results (in the same order of the items)
+        """
+        items = list(items)
+        # a single item is not worth a round-trip through the pool
+        if self._executor is None or len(items) < 2:
+            return map(func, items)
+
+        def task(item):
+            try:
+                return func(item)
+            finally:
+                # release the worker thread's database session (and its connection)
+                session.remove()
+
+        return self._executor.map(task, items)
+
+    def close(self):
+        """
+        Release the resources held by the client
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        session.remove()
+        http_session.close()
+
     @staticmethod
     def reset_news_db():
         """
         Reset the news database
         """
-        session.query(Articles).delete()
-        session.query(Websites).delete()
-        session.query(Images).delete()
+        # bulk DELETEs (children first), no ORM objects loaded or synchronized
+        session.query(Images).delete(synchronize_session=False)
+        session.query(Articles).delete(synchronize_session=False)
+        session.query(Websites).delete(synchronize_session=False)
         session.commit()
 
     def reset_experiment(self):
@@ -115,14 +189,8 @@ class YClientBase(object):
         :param filename: the file containing the rss feeds
         """
 
-        data = json.load(open(filename))
-        for f in tqdm.tqdm(data):
-            self.feed.add_feed(
-                name=f["name"],
-                url_feed=f["feed_url"],
-                category=f["category"],
-                leaning=f["leaning"],
-            )
+        data = load_json(filename)
+        self.feed.add_feeds(data, max_workers=self.n_workers)
 
     def set_interests(self):
         """
@@ -146,6 +214,29 @@ class YClientBase(object):
         self.content_recsys = c_recsys
         self.follow_recsys = f_recsys
 
+    def _generate_agent(self):
+        """
+        Generate a new agent and register it on the server
+
+        :return: the agent, None if the generation failed
+        """
+        try:
+            return generate_user(self.config, owner=self.agents_owner)
+        except Exception:
+            return None
+
+    def _setup_agent(self, agent):
+        """
+        Set the prompts and the recommendation systems of a new agent
+
+        :param agent: the agent to configure
+        """
+        try:
+            agent.set_prompts(self.prompts)
+            agent.set_rec_sys(self.content_recsys, self.follow_recsys)
+        except Exception:
+            pass
+
     def add_agent(self, agent=None):
         """
         Add an agent to the simulation
@@ -153,17 +244,24 @@ class YClientBase(object):
         :param agent: the agent to add
         """
         if agent is None:
-            try:
-                agent = generate_user(self.config, owner=self.agents_owner)
+            agent = self._generate_agent()
+            if agent is None:
+                return
+            self._setup_agent(agent)
+        self.agents.add_agent(agent)
 
-                if agent is None:
-                    return
-                agent.set_prompts(self.prompts)
-                agent.set_rec_sys(self.content_recsys, self.follow_recsys)
-            except Exception:
-                pass
-        if agent is not None:
-            self.agents.add_agent(agent)
+    def add_agents(self, n):
+        """
+        Generate and add new agents to the simulation
+
+        :param n: the number of agents to add
+        """
+        # agents are generated (and registered) by the workers, then configured
+        # and added sequentially since the Agents container is not thread-safe
+        for agent in self._map(lambda _: self._generate_agent(), range(n)):
+            if agent is not None:
+                self._setup_agent(agent)
+                self.agents.add_agent(agent)
 
     def create_initial_population(self):
         """
@@ -173,8 +271,7 @@ class YClientBase(object):
         self.set_interests()
 
         if self.agents_filename is None:
-            for _ in range(self.n_agents):
-                self.add_agent()
+            self.add_agents(self.n_agents)
 
             # if specified, create the initial friendship graph
             if self.g is not None:
@@ -191,15 +288,17 @@ class YClientBase(object):
                         pass
 
         else:
-            ags = json.load(open(self.agents_filename))
-            for data in ags:
-                agent = Agent(
+            ags = load_json(self.agents_filename)
+            agents = self._map(
+                lambda data: Agent(
                     name=data["name"],
                     email=data["email"],
                     config=self.config,
                     load=True,
-                )
-
+                ),
+                ags,
+            )
+            for agent in agents:
                 agent.set_prompts(self.prompts)
                 self.add_agent(agent)
 
@@ -208,20 +307,35 @@ class YClientBase(object):
         Save the agents to a file
         """
         res = self.agents.__dict__()
-        json.dump(res, open(self.agents_output, "w"), indent=4)
+        dump_json(res, self.agents_output)
+
+    def _load_agent(self, data):
+        """
+        Load an existing agent from the server
+
+        :param data: the agent description
+        :return: the agent, None if the loading failed
+        """
+        try:
+            return Agent(
+                name=data["name"], email=data["email"], load=True, config=self.config
+            )
+        except Exception:
+            print(f"Error loading agent: {data['name']}")
+            return None
 
     def load_existing_agents(self, a_file):
         """
         Load existing agents from a file
         :param a_file: the JSON file containing the agents
         """
-        agents = json.load(open(a_file, "r"))
+        agents = load_json(a_file)
 
-        for a in agents["agents"]:
+        # agents are fetched by the workers, then configured sequentially
+        for a, ag in zip(agents["agents"], self._map(self._load_agent, agents["agents"])):
+            if ag is None:
+                continue
             try:
-                ag = Agent(
-                    name=a["name"], email=a["email"], load=True, config=self.config
-                )
                 ag.set_prompts(self.prompts)
                 ag.set_rec_sys(self.content_recsys, self.follow_recsys)
                 self.agents.add_agent(ag)
@@ -252,6 +366,27 @@ class YClientBase(object):
 
             self.agents.remove_agent_by_ids(data)
 
+    def _agent_actions(self, agent, tid, rounds, reply=True):
+        """
+        Perform the actions of an agent in the current slot
+
+        :param agent: the agent
+        :param tid: the round id
+        :param rounds: the candidate actions of each round
+        :param reply: whether the agent replies to received mentions (not for pages)
+        """
+        for candidates in rounds:
+            # reply to received mentions
+            if reply:
+                agent.reply(tid=tid)
+
+            # select action to be performed
+            agent.select_action(
+                tid=tid,
+                actions=candidates,
+                max_length_thread_reading=self.max_length_thread_reading,
+            )
+
     def run_simulation(self):
         """
         Run the simulation
@@ -262,60 +397,60 @@ class YClientBase(object):
             daily_active = {}
             tid, _, _ = self.sim_clock.get_current_slot()
 
+            # page agents neither reply to mentions nor follow
+            page_ids = {id(p) for p in self.pages}
+
+            # expected active users per hour (at least 1, at most the whole
+            # population): the population only changes at the end of the day
+            n_agents = len(self.agents.agents)
+            expected_active = np.clip(
+                (n_agents * self._hourly_activity).astype(int), 1, n_agents
+            )
+
             for _ in tqdm.tqdm(range(self.slots)):
-                tid, _, h = self.sim_clock.get_current_slot()
+                # the clock is synced with the server at the start of the day
+                # and by increment_slot, no need to query it again
+                tid, h = self.sim_clock.id, self.sim_clock.slot
 
-                # get expected active users for this time slot (at least 1)
-                expected_active_users = max(
-                    int(len(self.agents.agents) * self.hourly_activity[str(h)]), 1
+                # sample the active agents (already in random order)
+                idx = self._rng.choice(
+                    n_agents, size=expected_active[h], replace=False
                 )
+                sagents = [self.agents.agents[i] for i in idx]
+
+                for g in sagents:
+                    daily_active[id(g)] = g
+
+                # candidate actions of each agent's rounds, drawn at once before the
+                # dispatch (two sampled with replacement, plus NONE)
+                n_rounds = [g.round_actions for g in sagents]
+                draws = self._rng.choice(
+                    self._acts, size=(sum(n_rounds), 2), p=self._acts_p
+                )
+                draws = np.hstack((draws, np.full((len(draws), 1), "NONE"))).tolist()
+                bounds = np.cumsum([0] + n_rounds).tolist()
+                rounds = [draws[i:j] for i, j in zip(bounds[:-1], bounds[1:])]
+
+                # agents' actions within a slot are independent
+                for _ in self._map(
+                    lambda task: self._agent_actions(
+                        task[0], tid, task[1], reply=id(task[0]) not in page_ids
+                    ),
+                    zip(sagents, rounds),
+                ):
+                    pass
 
-                sagents = random.sample(self.agents.agents, expected_active_users)
-
-                # available actions
-                acts = [a for a, v in self.actions_likelihood.items() if v > 0]
-
-                # shuffle agents
-                random.shuffle(sagents)
-                for g in tqdm.tqdm(sagents):
-                    daily_active[g.name] = None
-
-                    for _ in range(g.round_actions):
-                        # sample two elements from a list with replacement
-                        candidates = random.choices(
-                            acts,
-                            k=2,
-                            weights=[self.actions_likelihood[a] for a in acts],
-                        )
-                        candidates.append("NONE")
-
-                        # reply to received mentions
-                        if g not in self.pages:
-                            g.reply(tid=tid)
-
-                        # select action to be performed
-                        g.select_action(
-                            tid=tid,
-                            actions=candidates,
-                            max_length_thread_reading=self.max_length_thread_reading,
-                        )
                 # increment slot
                 self.sim_clock.increment_slot()
 
             # evaluate following (once per day, only for a random sample of daily active agents)
-            da = [
-                agent
-                for agent in self.agents.agents
-                if agent.name in daily_active
-                and agent not in self.pages
-                and random.random()
-                < float(self.config["agents"]["probability_of_daily_follow"])
-            ]
+            p_follow = float(self.config["agents"]["probability_of_daily_follow"])
+            users = [a for a in daily_active.values() if id(a) not in page_ids]
+            da = list(compress(users, self._rng.random(len(users)) < p_follow))
 
             print("\n\nEvaluating new friendship ties")
             for agent in tqdm.tqdm(da):
-                if agent not in self.pages:
-                    agent.select_action(tid=tid, actions=["FOLLOW", "NONE"])
+                agent.select_action(tid=tid, actions=["FOLLOW", "NONE"])
 
             total_users = len(self.agents.agents)
 
@@ -324,7 +459,7 @@ class YClientBase(object):
 
             # daily new agents
             if self.percentage_new_agents_iteration > 0:
-                for _ in range(
+                self.add_agents(
                     max(
                         1,
                         int(
@@ -332,8 +467,7 @@ class YClientBase(object):
                             * self.percentage_new_agents_iteration
                         ),
                     )
-                ):
-                    self.add_agent()
+                )
 
             # saving "living" agents at the end of the day
             if (
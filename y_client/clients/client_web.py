@@ -2,9 +2,10 @@ import json
 import sys
 import os
 import shutil
+from types import MappingProxyType
 from sqlalchemy.ext.declarative import declarative_base
 import sqlalchemy as db
-from requests import post
+from y_client.connection import post
 from sqlalchemy import orm
 
 
@@ -42,7 +43,10 @@ class YClientWeb(object):
         self.base_path = data_base_path
         self.config = config_file
 
-        self.prompts = json.load(open(f"{data_base_path}prompts.json", "r"))
+        # a single read-only copy of the prompts is shared by all the agents
+        self.prompts = MappingProxyType(
+            json.load(open(f"{data_base_path}prompts.json", "r"))
+        )
 
         self.agents_owner = owner
         self.agents_filename = agents_filename
@@ -1,8 +1,7 @@
 from y_client.clients.client_base import YClientBase
 from y_client.utils import generate_page
 import tqdm
-import json
-from y_client import Agent, PageAgent
+from y_client import PageAgent
 
 
 class YClientWithPages(YClientBase):
@@ -11,32 +10,34 @@ class YClientWithPages(YClientBase):
         self.pages = []
         self.page = None
 
+    def _load_agent(self, data):
+        """
+        Load an existing agent (or page) from the server
+
+        :param data: the agent description
+        :return: the agent, None if the loading failed
+        """
+        if data["is_page"] == 0:
+            return super()._load_agent(data)
+        try:
+            return PageAgent(
+                data["name"], email=data["email"], load=True, config=self.config
+            )
+        except Exception:
+            print(f"Error loading agent: {data['name']}")
+            return None
+
     def load_existing_agents(self, a_file):
         """
         Load existing agents from a file
         :param a_file: the JSON file containing the agents
         """
-        agents = json.load(open(a_file, "r"))
-
-        for a in agents["agents"]:
-            try:
-                if a["is_page"] == 0:
-                    ag = Agent(
-                        name=a["name"], email=a["email"], load=True, config=self.config
-                    )
-                    ag.set_prompts(self.prompts)
-                    ag.set_rec_sys(self.content_recsys, self.follow_recsys)
-                    self.agents.add_agent(ag)
-                else:
-                    ag = PageAgent(
-                        a["name"], email=a["email"], load=True, config=self.config
-                    )
-                    ag.set_prompts(self.prompts)
-                    ag.set_rec_sys(self.content_recsys, self.follow_recsys)
-                    self.agents.add_agent(ag)
-                    self.pages.append(ag)
-            except Exception:
-                print(f"Error loading agent: {a['name']}")
+        super().load_existing_agents(a_file)
+        self.pages.extend(
+            ag
+            for ag in self.agents.agents
+            if isinstance(ag, PageAgent) and ag not in self.pages
+        )
 
     def add_page_agent(self, agent=None, name=None, feed_url=None):
         """
@@ -0,0 +1,31 @@
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+__all__ = ["http_session", "get", "post", "configure"]
+
+# keep-alive connections to the server, shared by the client and its agents
+http_session = Session()
+
+
+def configure(n_workers=1):
+    """
+    Size the connection pools for the number of concurrent workers
+
+    :param n_workers: the number of threads issuing requests concurrently
+    """
+    for prefix in ("http://", "https://"):
+        http_session.mount(
+            prefix,
+            HTTPAdapter(
+                pool_connections=32,
+                pool_maxsize=max(10, n_workers),
+                max_retries=Retry(total=3, backoff_factor=0.1),
+            ),
+        )
+
+
+configure()
+
+get = http_session.get
+post = http_session.post
@@ -20,9 +20,13 @@ try:
         )
 
     base = declarative_base()
-    engine = db.create_engine(f"sqlite:///experiments/{config['simulation']['name']}.db")
+    engine = db.create_engine(
+        f"sqlite:///experiments/{config['simulation']['name']}.db",
+        connect_args={"check_same_thread": False},
+    )
     base.metadata.bind = engine
-    session = orm.scoped_session(orm.sessionmaker())(bind=engine)
+    # thread-local sessions: agents' actions may be dispatched by a pool of workers
+    session = orm.scoped_session(orm.sessionmaker(bind=engine))
 except:
     from y_client.clients.client_web import base, session
     pass
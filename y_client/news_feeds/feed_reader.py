@@ -9,6 +9,8 @@ except:
     from y_client.clients.client_web import session
     from .client_modals import Websites, Articles, Images
 import datetime
+import tqdm
+from concurrent.futures import ThreadPoolExecutor
 
 
 class News(object):
@@ -375,6 +377,79 @@ class Feeds(object):
         else:
             print("Please provide a feed url or a site url")
 
+    def add_feeds(self, feeds, max_workers=1):
+        """
+        Add several rss feeds to the collection.
+
+        The feeds are validated concurrently and the new websites are saved
+        in a single transaction. Entries without a feed url are resolved from
+        their website one by one (see add_feed).
+
+        :param feeds: list of feed dictionaries (name, feed_url, category, leaning and, optionally, url_site, language, country)
+        :param max_workers: the maximum number of concurrent feed validations
+        """
+        today = datetime.datetime.now()
+        today_morning = int(today.strftime("%Y%m%d"))
+
+        # new feeds only, each one once
+        seen = set()
+        candidates = []
+        for f in feeds:
+            if not f.get("feed_url"):
+                self.add_feed(
+                    name=f["name"],
+                    url_site=f.get("url_site"),
+                    category=f.get("category"),
+                    language=f.get("language"),
+                    leaning=f.get("leaning"),
+                    country=f.get("country"),
+                )
+                continue
+
+            key = (f["name"], f["feed_url"])
+            if key not in seen and self.__not_in_db(*key):
+                seen.add(key)
+                candidates.append(f)
+
+        # validating a feed downloads it: hide the network latency
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            valid = list(
+                tqdm.tqdm(
+                    executor.map(
+                        lambda f: self.__validate_feed(f["feed_url"]), candidates
+                    ),
+                    total=len(candidates),
+                )
+            )
+
+        for f, is_valid in zip(candidates, valid):
+            if not is_valid:
+                continue
+
+            self.feeds.append(
+                NewsFeed(
+                    f["name"],
+                    f["feed_url"],
+                    f.get("url_site"),
+                    f.get("category"),
+                    f.get("language"),
+                    f.get("leaning"),
+                    f.get("country"),
+                )
+            )
+            session.add(
+                Websites(
+                    name=f["name"],
+                    rss=f["feed_url"],
+                    country=f.get("country"),
+                    language=f.get("language"),
+                    leaning=f.get("leaning"),
+                    category=f.get("category"),
+                    last_fetched=today_morning,
+                )
+            )
+        session.commit()
+
     def get_feeds(self):
         """
         Get all the feeds in the collection.
@@ -1,5 +1,5 @@
 import json
-from requests import post
+from y_client.connection import post
 
 
 class ContentRecSys(object):
@@ -30,6 +30,7 @@ class ContentRecSys(object):
         Read n_posts from the service.
 
         :param base_url: the base url of the service
+        :param user_id: the id of the reading user
         :param articles: whether to return articles or not
         :return: the response from the service
         """
@@ -37,45 +38,49 @@ class ContentRecSys(object):
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
+        # per-call request: the recsys is shared by agents acting concurrently
+        params = dict(self.params, uid=user_id)
         if articles:
-            self.params["articles"] = True
+            params["articles"] = True
 
-        self.params["uid"] = user_id
-
-        st = json.dumps(self.params)
+        st = json.dumps(params)
 
         response = post(f"{api_url}", headers=headers, data=st)
 
         return response.__dict__["_content"].decode("utf-8")
 
-    def read_mentions(self, base_url):
+    def read_mentions(self, base_url, user_id=None):
         """
         Read n_posts from the service.
 
         :param base_url: the base url of the service
+        :param user_id: the id of the requesting user (default: the last one added)
         :return: the response from the service
         """
         api_url = f"{base_url}/read_mentions"
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-        st = json.dumps(self.params)
+        params = self.params if user_id is None else dict(self.params, uid=user_id)
+        st = json.dumps(params)
         response = post(f"{api_url}", headers=headers, data=st)
 
         return response.__dict__["_content"].decode("utf-8")
 
-    def search(self, base_url):
+    def search(self, base_url, user_id=None):
         """
         Search for a query.
 
         :param base_url: the base url of the service
+        :param user_id: the id of the requesting user (default: the last one added)
         :return: the response from the service
         """
         api_url = f"{base_url}/search"
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-        st = json.dumps(self.params)
+        params = self.params if user_id is None else dict(self.params, uid=user_id)
+        st = json.dumps(params)
         response = post(f"{api_url}", headers=headers, data=st)
 
         return response.__dict__["_content"].decode("utf-8")
@@ -1,5 +1,5 @@
 import json
-from requests import post
+from y_client.connection import post
 
 
 class FollowRecSys(object):
@@ -26,16 +26,21 @@ class FollowRecSys(object):
         """
         self.params["user_id"] = uid
 
-    def follow_suggestions(self, base_url):
+    def follow_suggestions(self, base_url, user_id=None):
         """
         Follow suggestions for a user.
 
         :param base_url: the base url of the service
+        :param user_id: the id of the user (default: the last one added)
         :return: the response from the service
         """
         api_url = f"{base_url}/follow_suggestions"
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        st = json.dumps(self.params)
+        # per-call request: the recsys is shared by agents acting concurrently
+        params = (
+            self.params if user_id is None else dict(self.params, user_id=user_id)
+        )
+        st = json.dumps(params)
         response = post(f"{api_url}", headers=headers, data=st)
 
         try:
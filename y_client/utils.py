@@ -1,11 +1,62 @@
 import random
 import json
+import functools
 import faker
 try:
     from y_client import Agent, PageAgent
 except:
     from y_client.classes.base_agent import Agent
     from y_client.classes.page_agent import PageAgent
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(filename):
+    """
+    Load a JSON file (parsed with orjson, when available)
+
+    :param filename: the JSON file
+    :return: the parsed content
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(obj, filename):
+    """
+    Save an object to a JSON file
+
+    :param obj: the object to save
+    :param filename: the JSON file
+    """
+    # always written by json: orjson only indents by 2 spaces, and the file
+    # format must not depend on which package is installed
+    with open(filename, "w") as f:
+        json.dump(obj, f, indent=4)
+
+
+@functools.lru_cache(maxsize=None)
+def _nationality_locales():
+    """
+    Load (once) the nationality to faker locale mapping
+    :return: the mapping
+    """
+    return load_json("config_files/nationality_locale.json")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_faker(locale=None):
+    """
+    Get the (cached) faker generator of a locale
+    :param locale: the faker locale, None for the default one
+    :return: the faker generator
+    """
+    return faker.Faker(locale)
 
 
 def generate_user(config, owner=None):
@@ -16,15 +67,15 @@ def generate_user(config, owner=None):
     :return: Agent object
     """
 
-    locales = json.load(open("config_files/nationality_locale.json"))
+    locales = _nationality_locales()
     try:
-        nationality = random.sample(config["agents"]["nationalities"], 1)[0]
+        nationality = random.choice(config["agents"]["nationalities"])
     except:
         nationality = "American"
 
-    gender = random.sample(["male", "female"], 1)[0]
+    gender = random.choice(["male", "female"])
 
-    fake = faker.Faker(locales[nationality])
+    fake = _get_faker(locales[nationality])
 
     if gender == "male":
         name = fake.name_male()
@@ -97,7 +148,6 @@ def generate_user(config, owner=None):
     )
 
     if not hasattr(agent, "user_id"):
-        print("here")
         return None
 
     return agent
@@ -112,7 +162,7 @@ def generate_page(config, owner=None, name=None, feed_url=None):
     :return: Agent object
     """
 
-    fake = faker.Faker()
+    fake = _get_faker()
 
     try:
         round_actions = fake.random_int(